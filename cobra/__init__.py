@@ -1,51 +1,61 @@
 """
 CoBrA: Cortical Brain Region Analysis
 
-A comprehensive Python library for analyzing cortical brain connectivity 
+A comprehensive Python library for analyzing cortical brain connectivity
 through correlation matrices, hierarchical clustering, and network visualization.
 """
 
+import importlib
+
 __version__ = "1.0.2"
 __author__ = "Sidd Lokray"
 __email__ = "siddharthlokray@gmail.com"
 __description__ = "Cortical Brain Region Analysis toolkit"
 
-# Import main modules
-from . import cluster
-from . import network
+# Submodules and the key functions they provide, resolved lazily (PEP 562)
+# so `import cobra` doesn't transitively pull matplotlib/scipy/networkx
+_SUBMODULES = {'cluster', 'network'}
+
+_FUNCTION_MODULES = {
+    'prepare_clustering_data': 'cluster',
+    'plot_original_correlation_matrix': 'cluster',
+    'create_clustered_correlation_matrix': 'cluster',
+    'create_main_clustering_visualization': 'cluster',
+    'plot_cluster_summary': 'cluster',
+    'analyze_clusters': 'cluster',
+    'generate_example_colors': 'cluster',
+    'make_network_graph': 'network',
+}
+
 
-# Import key functions for direct access
-from .cluster import (
-    prepare_clustering_data,
-    create_clustered_correlation_matrix,
-    create_main_clustering_visualization,
-    plot_cluster_summary,
-    analyze_clusters,
-    generate_example_colors,
-    prepare_clustering_data
-)
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    if name in _FUNCTION_MODULES:
+        module = importlib.import_module(f'.{_FUNCTION_MODULES[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from .network import (
-    make_network_graph
-)
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES | set(_FUNCTION_MODULES))
 
 
 # Define what's available when using "from cobra import *"
 __all__ = [
     # Modules
-    'clustering',
-    'visualization', 
+    'cluster',
     'network',
-    
+
     # Key functions
     'prepare_clustering_data',
+    'plot_original_correlation_matrix',
     'create_clustered_correlation_matrix',
     'create_main_clustering_visualization',
     'plot_cluster_summary',
     'analyze_clusters',
     'generate_example_colors',
-    'plot_original_correlation_matrix',
-    'make_network_graph'
+    'make_network_graph',
 ]
 
 # Package metadata
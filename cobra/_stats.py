@@ -0,0 +1,96 @@
+"""
+Optional numba-accelerated kernels.
+
+Importing this module never fails: when numba is not installed, every
+kernel name is None and callers fall back to their numpy paths.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None:
+
+    @numba.njit(parallel=True, cache=True)
+    def cluster_stats(matrix, order, starts, counts):
+        """
+        Per-cluster mean/std/min/max over within-cluster upper triangles.
+
+        matrix is the full connectivity matrix; order is the argsort of the
+        cluster labels, and starts/counts delimit each cluster's slice of it.
+        Returns an (n_clusters, 4) array of [mean, std, min, max]; rows for
+        single-region clusters stay NaN. One fused loop per cluster replaces
+        the gather-submatrix + four-reduction numpy sequence, parallelized
+        across clusters.
+        """
+        out = np.full((counts.shape[0], 4), np.nan)
+        for c in numba.prange(counts.shape[0]):
+            k = counts[c]
+            if k < 2:
+                continue
+            start = starts[c]
+            total = 0.0
+            total_sq = 0.0
+            corr_min = np.inf
+            corr_max = -np.inf
+            n_pairs = 0
+            for i in range(k):
+                ii = order[start + i]
+                for j in range(i + 1, k):
+                    jj = order[start + j]
+                    v = matrix[ii, jj]
+                    total += v
+                    total_sq += v * v
+                    if v < corr_min:
+                        corr_min = v
+                    if v > corr_max:
+                        corr_max = v
+                    n_pairs += 1
+            mean = total / n_pairs
+            variance = total_sq / n_pairs - mean * mean
+            if variance < 0.0:
+                variance = 0.0
+            out[c, 0] = mean
+            out[c, 1] = np.sqrt(variance)
+            out[c, 2] = corr_min
+            out[c, 3] = corr_max
+        return out
+    @numba.njit(parallel=True, cache=True)
+    def scan_upper_triangle(matrix, threshold):
+        """
+        Indices and values of upper-triangle entries with |v| > threshold.
+
+        Two parallel passes -- count per row, then fill at precomputed
+        offsets -- so the output arrays are allocated exactly once and the
+        scan never materializes the full triu index arrays the numpy path
+        needs. Returns (rows, cols, values).
+        """
+        n = matrix.shape[0]
+        counts = np.zeros(n, np.int64)
+        for i in numba.prange(n):
+            c = 0
+            for j in range(i + 1, n):
+                if abs(matrix[i, j]) > threshold:
+                    c += 1
+            counts[i] = c
+        offsets = np.cumsum(counts) - counts
+        total = int(counts.sum())
+        out_i = np.empty(total, np.int64)
+        out_j = np.empty(total, np.int64)
+        out_v = np.empty(total, np.float64)
+        for i in numba.prange(n):
+            k = offsets[i]
+            for j in range(i + 1, n):
+                v = matrix[i, j]
+                if abs(v) > threshold:
+                    out_i[k] = i
+                    out_j[k] = j
+                    out_v[k] = v
+                    k += 1
+        return out_i, out_j, out_v
+else:
+    cluster_stats = None
+    scan_upper_triangle = None
@@ -1,34 +1,112 @@
-import pandas as pd
+import re
+
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.cluster.hierarchy import dendrogram, linkage, fcluster
+from scipy.cluster.hierarchy import linkage, fcluster, leaves_list
 from scipy.spatial.distance import squareform
-from scipy.stats import kendalltau
-from sklearn.cluster import AgglomerativeClustering
-
-def prepare_clustering_data(connectivity_matrix, regions):
+from scipy.stats import describe
+
+from ._stats import cluster_stats as _numba_cluster_stats
+
+# fastcluster provides a drop-in O(n^2) Ward linkage (scipy's is O(n^3));
+# fall back to scipy when it isn't installed
+try:
+    import fastcluster
+except ImportError:
+    fastcluster = None
+
+# xxhash fingerprints MB-scale arrays far faster than hashlib; fall back
+# to blake2b when it isn't installed
+try:
+    import xxhash
+
+    def _matrix_fingerprint(matrix):
+        return xxhash.xxh3_64_intdigest(matrix.tobytes())
+except ImportError:
+    import hashlib
+
+    def _matrix_fingerprint(matrix):
+        return hashlib.blake2b(matrix.tobytes(), digest_size=16).digest()
+
+# Memoize linkage results so re-rendering the same matrix with different
+# display options (labels, colors, intervals) skips the clustering entirely
+_LINKAGE_CACHE_SIZE = 8
+_linkage_cache = {}
+
+def _copy_linkage_entry(entry):
+    # Hand out copies so callers can write to the returned arrays without
+    # corrupting the cached originals
+    distance_matrix, condensed_distances, linkage_matrix = entry
+    return (distance_matrix.copy() if distance_matrix is not None else None,
+            condensed_distances.copy(), linkage_matrix.copy())
+
+def prepare_clustering_data(connectivity_matrix, regions, return_dense=True):
     """
     Prepare data for clustering analysis
+
+    Results are cached on a fingerprint of the input matrix, so repeated
+    calls with the same data return immediately. With return_dense=False the
+    dense n x n distance matrix is never materialized and None is returned
+    in its place; callers that only need the linkage should pass False.
     """
-    # Convert correlation to distance (1 - correlation for positive correlations)
-    distance_matrix = 1 - connectivity_matrix
+    # Normalize to a contiguous layout once up front. float32 inputs (common
+    # from fMRI pipelines) stay float32 through the O(n^2) distance work --
+    # half the memory traffic -- and only the much smaller condensed vector
+    # is promoted to the double precision linkage requires. Everything else
+    # goes to float64 here so linkage never makes its own hidden copy.
+    work_dtype = np.float32 if np.asarray(connectivity_matrix).dtype == np.float32 \
+        else np.float64
+    C = np.ascontiguousarray(connectivity_matrix, dtype=work_dtype)
+
+    cache_key = (C.shape, C.dtype.str, _matrix_fingerprint(C))
+    cached = _linkage_cache.get(cache_key)
+    if cached is not None:
+        if return_dense and cached[0] is None:
+            cached[0] = squareform(cached[1])
+        return _copy_linkage_entry(cached)
+
+    # Build the condensed distance vector directly from the upper triangle:
+    # averaging M[i,j] with M[j,i] symmetrizes, 1 - r converts correlation to
+    # distance, and the diagonal never enters the condensed form. This avoids
+    # materializing a dense n x n distance matrix just to condense it again.
+    # In-place ops keep it to a single allocated vector.
+    n = C.shape[0]
+    iu = np.triu_indices(n, k=1)
+    condensed_distances = C[iu]
+    if np.array_equal(C, C.T):
+        # Already symmetric -- the common case for correlation matrices --
+        # so skip the transpose gather and averaging entirely
+        np.subtract(1.0, condensed_distances, out=condensed_distances)
+    else:
+        condensed_distances += C.T[iu]
+        condensed_distances *= -0.5
+        condensed_distances += 1.0
+    np.maximum(condensed_distances, 0.0, out=condensed_distances)
 
-    # Ensure distance matrix is valid (non-negative, symmetric)
-    distance_matrix = np.maximum(distance_matrix, 0)
-    distance_matrix = (distance_matrix + distance_matrix.T) / 2
-    np.fill_diagonal(distance_matrix, 0)
+    # Promote at the linkage boundary; a no-op for float64 work arrays
+    condensed_distances = condensed_distances.astype(np.float64, copy=False)
 
-    # Convert to condensed form for hierarchical clustering
-    condensed_distances = squareform(distance_matrix)
+    # Dense form reconstructed only for callers that still want it
+    distance_matrix = squareform(condensed_distances) if return_dense else None
 
     # Perform hierarchical clustering
-    linkage_matrix = linkage(condensed_distances, method='ward')
+    if fastcluster is not None:
+        # preserve_input must stay True: condensed_distances is returned below
+        linkage_matrix = fastcluster.linkage(condensed_distances, method='ward')
+    else:
+        linkage_matrix = linkage(condensed_distances, method='ward')
 
-    return distance_matrix, condensed_distances, linkage_matrix
+    # Cache entries are lists so a later return_dense=True call can fill in
+    # the dense slot on an existing entry
+    entry = [distance_matrix, condensed_distances, linkage_matrix]
+    if len(_linkage_cache) >= _LINKAGE_CACHE_SIZE:
+        _linkage_cache.pop(next(iter(_linkage_cache)))
+    _linkage_cache[cache_key] = entry
+    return _copy_linkage_entry(entry)
 
 def plot_original_correlation_matrix(connectivity_matrix, regions, figsize=(12, 10),
-                                   region_colors=None, show_labels=True, label_interval=1):
+                                   region_colors=None, show_labels=True, label_interval=1,
+                                   ax=None):
     """
     Plot the original correlation matrix heatmap with improved label handling
 
@@ -46,10 +124,28 @@ def plot_original_correlation_matrix(connectivity_matrix, regions, figsize=(12,
         Whether to show tick labels
     label_interval : int
         Show every nth label to reduce crowding
+    ax : matplotlib axes or None
+        Axes to draw into; reusing one avoids allocating a new Figure per call
     """
-    fig, ax = plt.subplots(figsize=figsize)
-
-    im = ax.imshow(connectivity_matrix, cmap='RdBu_r', aspect='auto', vmin=-1, vmax=1)
+    if ax is None:
+        fig, ax = plt.subplots(figsize=figsize)
+    else:
+        fig = ax.figure
+        # ax.clear() leaves any previously attached colorbar in place, so
+        # drop ours explicitly or repeated draws into the same axes stack
+        # colorbars and shrink the plot
+        cbar = getattr(ax, '_cobra_colorbar', None)
+        if cbar is not None:
+            cbar.remove()
+        ax.clear()
+
+    # pcolormesh with rasterized=True keeps axes/labels vector while storing
+    # the cell grid as one raster layer; shading='nearest' centers cells on
+    # integer indices like imshow did, and inverting the y-axis matches the
+    # imshow orientation
+    im = ax.pcolormesh(connectivity_matrix, cmap='RdBu_r', vmin=-1, vmax=1,
+                       rasterized=True, shading='nearest')
+    ax.invert_yaxis()
     ax.set_title('Original Correlation Matrix', fontsize=16, fontweight='bold', pad=20)
 
     if show_labels:
@@ -73,7 +169,7 @@ def plot_original_correlation_matrix(connectivity_matrix, regions, figsize=(12,
         ax.set_xticks([])
         ax.set_yticks([])
 
-    plt.colorbar(im, ax=ax, label='Kendall Tau', shrink=0.8)
+    ax._cobra_colorbar = plt.colorbar(im, ax=ax, label='Kendall Tau', shrink=0.8)
     plt.tight_layout()
     plt.show()
 
@@ -81,7 +177,7 @@ def plot_original_correlation_matrix(connectivity_matrix, regions, figsize=(12,
 
 def create_clustered_correlation_matrix(connectivity_matrix, regions, n_clusters=None,
                                       figsize=(14, 12), region_colors=None,
-                                      show_labels=True, label_interval=1):
+                                      show_labels=True, label_interval=1, ax=None):
     """
     Create and display the clustered correlation matrix with cluster boundaries and improved labeling
 
@@ -101,9 +197,13 @@ def create_clustered_correlation_matrix(connectivity_matrix, regions, n_clusters
         Whether to show tick labels
     label_interval : int
         Show every nth label to reduce crowding
+    ax : matplotlib axes or None
+        Axes to draw into; reusing one avoids allocating a new Figure per call
     """
-    # Prepare clustering data
-    distance_matrix, condensed_distances, linkage_matrix = prepare_clustering_data(connectivity_matrix, regions)
+    # Prepare clustering data; only the linkage is needed here, so skip the
+    # dense distance matrix
+    _, _, linkage_matrix = prepare_clustering_data(connectivity_matrix, regions,
+                                                   return_dense=False)
 
     # Determine optimal number of clusters if not provided
     if n_clusters is None:
@@ -112,21 +212,37 @@ def create_clustered_correlation_matrix(connectivity_matrix, regions, n_clusters
     # Get cluster assignments
     cluster_labels = fcluster(linkage_matrix, n_clusters, criterion='maxclust')
 
-    # Reorder matrix based on clustering
-    cluster_order = np.argsort(cluster_labels)
-    reordered_matrix = connectivity_matrix[cluster_order, :][:, cluster_order]
-    reordered_regions = [regions[i] for i in cluster_order]
+    # Reorder rows by the dendrogram's leaf order: O(n) straight from the
+    # linkage, keeps each fcluster block contiguous, and preserves the
+    # within-cluster structure so the heatmap shows cleaner blocks than a
+    # plain label sort. np.ix_ gathers rows and columns in one pass instead
+    # of materializing an intermediate row-reordered matrix.
+    cluster_order = leaves_list(linkage_matrix)
+    reordered_matrix = connectivity_matrix[np.ix_(cluster_order, cluster_order)]
+    # Gather names (and colors) with a C-level take instead of a Python
+    # list comprehension per item
+    reordered_regions = np.asarray(regions, dtype=object)[cluster_order].tolist()
     reordered_clusters = cluster_labels[cluster_order]
 
     # Reorder colors if provided
     reordered_colors = None
     if region_colors is not None:
-        reordered_colors = [region_colors[i] for i in cluster_order]
+        reordered_colors = np.asarray(region_colors, dtype=object)[cluster_order].tolist()
 
     # Create the plot
-    fig, ax = plt.subplots(figsize=figsize)
+    if ax is None:
+        fig, ax = plt.subplots(figsize=figsize)
+    else:
+        fig = ax.figure
+        # As in plot_original_correlation_matrix, remove our stale colorbar
+        # before clearing so reuse doesn't accumulate one per call
+        cbar = getattr(ax, '_cobra_colorbar', None)
+        if cbar is not None:
+            cbar.remove()
+        ax.clear()
 
     im = ax.imshow(reordered_matrix, cmap='RdBu_r', aspect='auto', vmin=-1, vmax=1)
+    im.set_rasterized(True)
     ax.set_title(f'Clustered Correlation Matrix ({n_clusters} clusters)',
                 fontsize=16, fontweight='bold', pad=20)
 
@@ -151,55 +267,60 @@ def create_clustered_correlation_matrix(connectivity_matrix, regions, n_clusters
         ax.set_xticks([])
         ax.set_yticks([])
 
-    # Add cluster boundaries
-    cluster_boundaries = []
-    current_cluster = reordered_clusters[0]
-    for i, cluster in enumerate(reordered_clusters):
-        if cluster != current_cluster:
-            cluster_boundaries.append(i - 0.5)
-            current_cluster = cluster
+    # Add cluster boundaries wherever consecutive labels change; a single
+    # diff pass plus batched hlines/vlines instead of per-boundary axlines
+    cluster_boundaries = np.flatnonzero(np.diff(reordered_clusters)) + 0.5
+    if cluster_boundaries.size:
+        ax.hlines(cluster_boundaries, *ax.get_xlim(), colors='black', linewidth=2)
+        ax.vlines(cluster_boundaries, *ax.get_ylim(), colors='black', linewidth=2)
 
-    for boundary in cluster_boundaries:
-        ax.axhline(y=boundary, color='black', linewidth=2)
-        ax.axvline(x=boundary, color='black', linewidth=2)
-
-    plt.colorbar(im, ax=ax, label='Kendall Tau', shrink=0.8)
+    ax._cobra_colorbar = plt.colorbar(im, ax=ax, label='Kendall Tau', shrink=0.8)
     plt.tight_layout()
     plt.show()
 
     return fig, ax, cluster_labels, reordered_matrix, reordered_regions
 
-def plot_cluster_summary(regions, cluster_labels, figsize=(10, 12)):
+def plot_cluster_summary(regions, cluster_labels, figsize=(10, 12), ax=None):
     """
     Create a text-based cluster summary visualization with better formatting
+
+    Pass an existing axes via ax to reuse a Figure across repeated calls.
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    if ax is None:
+        fig, ax = plt.subplots(figsize=figsize)
+    else:
+        fig = ax.figure
+        ax.clear()
     ax.axis('off')
 
     n_clusters = len(np.unique(cluster_labels))
 
-    # Create cluster summary text
-    cluster_summary = "Cluster Assignments:\n\n"
+    # Create cluster summary text; collect fragments in a list and join once
+    # at the end -- repeated += on a growing string is quadratic
+    parts = ["Cluster Assignments:\n\n"]
     for cluster_id in range(1, n_clusters + 1):
         cluster_regions = [regions[i] for i in range(len(regions)) if cluster_labels[i] == cluster_id]
-        cluster_summary += f"Cluster {cluster_id} ({len(cluster_regions)} regions):\n"
+        parts.append(f"Cluster {cluster_id} ({len(cluster_regions)} regions):\n")
 
         # Format regions in columns if there are many
         if len(cluster_regions) > 10:
-            # Split into multiple columns
+            # Column-major 3-column grid assembled with one pad/reshape and
+            # one vectorized ljust instead of per-cell f-string formatting
             cols = 3
             col_size = len(cluster_regions) // cols + (1 if len(cluster_regions) % cols else 0)
-            for row in range(col_size):
-                line = "  "
-                for col in range(cols):
-                    idx = row + col * col_size
-                    if idx < len(cluster_regions):
-                        line += f"• {cluster_regions[idx]:<25}"
-                cluster_summary += line.rstrip() + "\n"
+            padded = np.full(cols * col_size, '', dtype=object)
+            padded[:len(cluster_regions)] = cluster_regions
+            grid = padded.reshape(cols, col_size).T
+            cells = np.char.add("• ", np.char.ljust(grid.astype(str), 25))
+            cells[grid == ''] = ''
+            for row in cells:
+                parts.append(("  " + "".join(row)).rstrip() + "\n")
         else:
             for region in cluster_regions:
-                cluster_summary += f"  • {region}\n"
-        cluster_summary += "\n"
+                parts.append(f"  • {region}\n")
+        parts.append("\n")
+
+    cluster_summary = "".join(parts)
 
     ax.text(0.05, 0.95, cluster_summary, transform=ax.transAxes, fontsize=8,
             verticalalignment='top', fontfamily='monospace',
@@ -216,10 +337,29 @@ def analyze_clusters(connectivity_matrix, regions, cluster_labels):
     """
     print("=== CLUSTER ANALYSIS ===\n")
 
-    n_clusters = len(np.unique(cluster_labels))
-
-    for cluster_id in range(1, n_clusters + 1):
-        cluster_indices = np.where(cluster_labels == cluster_id)[0]
+    # Partition the labels with one stable sort + unique scan instead of a
+    # full np.where pass over cluster_labels per cluster
+    cluster_labels = np.asarray(cluster_labels)
+    connectivity_matrix = np.asarray(connectivity_matrix)
+    order = np.argsort(cluster_labels, kind='stable')
+    uniq_ids, starts, counts = np.unique(cluster_labels[order],
+                                         return_index=True, return_counts=True)
+
+    # With numba available, one parallel kernel computes every cluster's
+    # mean/std/min/max in a single fused pass with no per-cluster gathers
+    stats_table = None
+    if _numba_cluster_stats is not None:
+        stats_table = _numba_cluster_stats(
+            np.ascontiguousarray(connectivity_matrix, dtype=np.float64),
+            order, starts.astype(np.int64), counts.astype(np.int64))
+
+    # Scratch buffer sized for the largest cluster's upper triangle; reused
+    # across clusters so each iteration is allocation-free
+    max_k = int(counts.max()) if counts.size else 0
+    scratch = np.empty(max_k * (max_k - 1) // 2, dtype=connectivity_matrix.dtype)
+
+    for pos, (cluster_id, start, count) in enumerate(zip(uniq_ids, starts, counts)):
+        cluster_indices = order[start:start + count]
         cluster_regions = [regions[i] for i in cluster_indices]
 
         print(f"CLUSTER {cluster_id} ({len(cluster_regions)} regions):")
@@ -227,15 +367,29 @@ def analyze_clusters(connectivity_matrix, regions, cluster_labels):
 
         # Calculate within-cluster correlations
         if len(cluster_indices) > 1:
-            cluster_matrix = connectivity_matrix[np.ix_(cluster_indices, cluster_indices)]
-            # Get upper triangular part (excluding diagonal)
-            upper_tri = np.triu(cluster_matrix, k=1)
-            within_cluster_corrs = upper_tri[upper_tri != 0]
+            if stats_table is not None:
+                corr_mean, corr_std, corr_min, corr_max = stats_table[pos]
+            else:
+                # Gather the submatrix (contiguous copy) and take its upper
+                # triangle straight into the shared scratch buffer; unlike the
+                # np.triu + nonzero-mask trick this keeps genuine zero
+                # correlations and allocates nothing per cluster
+                k = len(cluster_indices)
+                cluster_matrix = connectivity_matrix[np.ix_(cluster_indices, cluster_indices)]
+                iu_rows, iu_cols = np.triu_indices(k, k=1)
+                within_cluster_corrs = scratch[:iu_rows.size]
+                np.take(cluster_matrix, iu_rows * k + iu_cols, out=within_cluster_corrs)
+
+                # One fused pass over the correlations instead of four
+                # separate reductions (mean/std/min/max each re-reading it)
+                stats = describe(within_cluster_corrs, ddof=0)
+                corr_mean, corr_std = stats.mean, np.sqrt(stats.variance)
+                corr_min, corr_max = stats.minmax
 
             print(f"Within-cluster correlations:")
-            print(f"  Mean: {np.mean(within_cluster_corrs):.3f}")
-            print(f"  Std:  {np.std(within_cluster_corrs):.3f}")
-            print(f"  Range: [{np.min(within_cluster_corrs):.3f}, {np.max(within_cluster_corrs):.3f}]")
+            print(f"  Mean: {corr_mean:.3f}")
+            print(f"  Std:  {corr_std:.3f}")
+            print(f"  Range: [{corr_min:.3f}, {corr_max:.3f}]")
         else:
             print("Single region cluster - no within-cluster correlations")
 
@@ -269,6 +423,21 @@ def create_main_clustering_visualization(connectivity_matrix, regions, n_cluster
 
     return cluster_labels, reordered_matrix, reordered_regions
 
+# Compiled keyword union + color lookup for the 'network' color scheme; one
+# C-level regex scan per region replaces five interpreted substring scans.
+# 'front' also matches 'frontal', covering both historical checks. Dict
+# order mirrors the old if/elif chain: when a name contains several
+# keywords, the earliest entry here wins, not the leftmost match.
+_NETWORK_RE = re.compile(r'(front|parietal|temporal|occipital|cingulate)')
+_NETWORK_COLORS = {
+    'front': 'red',
+    'parietal': 'blue',
+    'temporal': 'green',
+    'occipital': 'orange',
+    'cingulate': 'purple',
+}
+_NETWORK_PRIORITY = {kw: i for i, kw in enumerate(_NETWORK_COLORS)}
+
 def generate_example_colors(regions, color_scheme='network'):
     """
     Generate example color schemes for regions
@@ -287,22 +456,15 @@ def generate_example_colors(regions, color_scheme='network'):
     n_regions = len(regions)
 
     if color_scheme == 'network':
-        # Example: different colors for different brain networks
-        colors = []
-        for i, region in enumerate(regions):
-            if 'frontal' in region.lower() or 'front' in region.lower():
-                colors.append('red')
-            elif 'parietal' in region.lower():
-                colors.append('blue')
-            elif 'temporal' in region.lower():
-                colors.append('green')
-            elif 'occipital' in region.lower():
-                colors.append('orange')
-            elif 'cingulate' in region.lower():
-                colors.append('purple')
-            else:
-                colors.append('black')
-        return colors
+        # Example: different colors for different brain networks. Lower all
+        # names in one vectorized pass, then match each against the compiled
+        # keyword union and map the hit through the color table
+        lowered = np.char.lower(np.asarray(regions, dtype=str))
+        return [
+            _NETWORK_COLORS[min(hits, key=_NETWORK_PRIORITY.__getitem__)]
+            if (hits := _NETWORK_RE.findall(name)) else 'black'
+            for name in lowered
+        ]
 
     elif color_scheme == 'random':
         np.random.seed(42)  # For reproducibility